@@ -153,7 +153,7 @@ U{W3C® SOFTWARE NOTICE AND LICENSE<href="http://www.w3.org/Consortium/Legal/200
 @var builtInTransformers: List of built-in transformers that are to be run regardless, because they are part of the RDFa spec
 @var CACHE_DIR_VAR: Environment variable used to define cache directories for RDFa vocabularies in case the default setting does not work or is not appropriate.
 @var rdfa_current_version: Current "official" version of RDFa that this package implements by default. This can be changed at the invocation of the package
-@var uri_schemes: List of registered (or widely used) URI schemes; used for warnings...
+@var uri_schemes: Set of registered (or widely used) URI schemes; used for warnings...
 """
 
 __version__ = "4.0.0"
@@ -344,7 +344,9 @@ other_used_schemes = [
 	"hdl", "isbn", "issn", "mstp", "rtmp", "rtspu", "stp"
 ]
 
-uri_schemes = registered_iana_schemes + unofficial_common + historical_iana_schemes + provisional_iana_schemes + other_used_schemes
+# The schemes are checked for each URI and prefix in a document, ie, a set is used for the membership tests (the lists above
+# also overlap a bit, the set takes care of that, too)
+uri_schemes = frozenset(registered_iana_schemes + unofficial_common + historical_iana_schemes + provisional_iana_schemes + other_used_schemes)
 
 # List of built-in transformers that are to be run regardless, because they are part of the RDFa spec
 builtInTransformers = [
@@ -437,12 +439,12 @@ class pyRdfa :
 						self.required_base = "file://" + os.path.join(os.getcwd(),name)
 					if self.media_type == "" :
 						self.media_type = MediaTypes.xml
-						# see if the default should be overwritten
-						for suffix in preferred_suffixes :
-							if name.endswith(suffix) :
-								self.media_type = preferred_suffixes[suffix]
-								self.charset = 'utf-8'
-								break
+						# see if the default should be overwritten; all the suffixes are of the form '.xxx', ie, a (case insensitive)
+						# dictionary lookup of the tail from the last '.' is enough
+						suffix = name[name.rfind('.'):].lower()
+						if suffix in preferred_suffixes :
+							self.media_type = preferred_suffixes[suffix]
+							self.charset = 'utf-8'
 						self.options.set_host_language(self.media_type)
 					return open(name)
 			else :
@@ -640,7 +642,8 @@ class pyRdfa :
 
 				else :
 					from .host import adjust_xhtml_and_version
-					if isinstance(input, StringIO) or isinstance(input, file):
+					# Any file-like object (StringIO, BytesIO, file, HTTP response...) can be parsed directly
+					if hasattr(input, "read") :
 						parse = xml.dom.minidom.parse
 					else:
 						parse = xml.dom.minidom.parseString
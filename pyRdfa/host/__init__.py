@@ -17,12 +17,12 @@ U{W3C® SOFTWARE NOTICE AND LICENSE<href="http://www.w3.org/Consortium/Legal/200
 @var content_to_host_language: a dictionary mapping a media type to a host language
 @var preferred_suffixes: mapping from preferred suffixes for media types; used if the file is local, ie, there is not HTTP return value for the media type. It corresponds to the preferred suffix in the media type registration
 @var initial_contexts: mapping from host languages to list of initial contexts
-@var accept_xml_base: list of host languages that accept the xml:base attribute for base setting
-@var accept_xml_lang: list of host languages that accept the xml:lang attribute for language setting. Note that XHTML and HTML have some special rules, and those are hard coded...
-@var warn_xmlns_usage: list of host languages that should generate a warning for the usage of @xmlns (for RDFa 1.1)
-@var accept_embedded_rdf_xml: list of host languages that might also include RDF data using an embedded RDF/XML (e.g., SVG). That RDF data may be merged with the output
-@var accept_embedded_turtle: list of host languages that might also include RDF data using a C{script} element. That RDF data may be merged with the output
-@var require_embedded_rdf: list of languages that must accept embedded RDF, ie, the corresponding option is irrelevant
+@var accept_xml_base: set of host languages that accept the xml:base attribute for base setting
+@var accept_xml_lang: set of host languages that accept the xml:lang attribute for language setting. Note that XHTML and HTML have some special rules, and those are hard coded...
+@var warn_xmlns_usage: set of host languages that should generate a warning for the usage of @xmlns (for RDFa 1.1)
+@var accept_embedded_rdf_xml: set of host languages that might also include RDF data using an embedded RDF/XML (e.g., SVG). That RDF data may be merged with the output
+@var accept_embedded_turtle: set of host languages that might also include RDF data using a C{script} element. That RDF data may be merged with the output
+@var require_embedded_rdf: set of languages that must accept embedded RDF, ie, the corresponding option is irrelevant
 @var host_dom_transforms: dictionary mapping a host language to an array of methods that are invoked at the beginning of the parsing process for a specific node. That function can do a last minute change on that DOM node, eg, adding or modifying an attribute. The method's signature is (node, state), where node is the DOM node, and state is the L{Execution context<pyRdfa.state.ExecutionContext>}.
 @var predefined_1_0_rel: terms that are hardcoded for HTML+RDF1.0 and replace the initial context for that version
 @var beautifying_prefixes: this is really just to make the output more attractive: for each media type a dictionary of prefix-URI pairs that can be used to make the terms look better...
@@ -71,17 +71,18 @@ beautifying_prefixes = {
 }
 
 
-accept_xml_base		= [ HostLanguage.rdfa_core, HostLanguage.atom, HostLanguage.svg,  HostLanguage.xhtml5 ]
-accept_xml_lang		= [ HostLanguage.rdfa_core, HostLanguage.atom, HostLanguage.svg ]
+# The lists below are only used for membership tests, done for (almost) every node; hence the frozensets
+accept_xml_base		= frozenset([ HostLanguage.rdfa_core, HostLanguage.atom, HostLanguage.svg,  HostLanguage.xhtml5 ])
+accept_xml_lang		= frozenset([ HostLanguage.rdfa_core, HostLanguage.atom, HostLanguage.svg ])
 
-accept_embedded_rdf_xml	= [ HostLanguage.svg, HostLanguage.rdfa_core ]
-accept_embedded_turtle	= [ HostLanguage.svg, HostLanguage.html5, HostLanguage.xhtml5, HostLanguage.xhtml ]
+accept_embedded_rdf_xml	= frozenset([ HostLanguage.svg, HostLanguage.rdfa_core ])
+accept_embedded_turtle	= frozenset([ HostLanguage.svg, HostLanguage.html5, HostLanguage.xhtml5, HostLanguage.xhtml ])
 
 # some languages, eg, SVG, require that embedded content should be combined with the default graph,
 # ie, it cannot be turned down by an option
-require_embedded_rdf    = [ HostLanguage.svg ]
+require_embedded_rdf    = frozenset([ HostLanguage.svg ])
 
-warn_xmlns_usage = [ HostLanguage.html5, HostLanguage.xhtml5, HostLanguage.xhtml ]
+warn_xmlns_usage = frozenset([ HostLanguage.html5, HostLanguage.xhtml5, HostLanguage.xhtml ])
 
 host_dom_transforms = {
 	HostLanguage.atom   : [atom_add_entry_type],
@@ -112,6 +113,7 @@ class MediaTypes :
 	xml		= 'application/xml'
 	xmlt	= 'text/xml'
 	nt		= 'text/plain'
+	ntriples	= 'application/n-triples'
 	
 # mapping from (some) content types to RDFa host languages. This may control the exact processing or at least the initial context (see below)...
 content_to_host_language = {
@@ -43,6 +43,13 @@ else :
 from .      import IncorrectBlankNodeUsage, err_no_blank_node
 from .utils import has_one_of_attributes
 
+# URI-s used when generating triples; these are constants, there is no reason to recreate them for every node
+rdf_type	= ns_rdf["type"]
+rdf_first	= ns_rdf["first"]
+rdf_rest	= ns_rdf["rest"]
+rdf_nil		= ns_rdf["nil"]
+xhv_role	= URIRef('http://www.w3.org/1999/xhtml/vocab#role')
+
 #######################################################################
 def parse_one_node(node, graph, parent_object, incoming_state, parent_incomplete_triples) :
 	"""The (recursive) step of handling a single node. 
@@ -63,7 +70,7 @@ def parse_one_node(node, graph, parent_object, incoming_state, parent_incomplete
 	@rtype: Boolean
 	"""
 	# Branch according to versions.
-	if incoming_state.rdfa_version >= "1.1" :
+	if incoming_state.rdfa_11 :
 		_parse_1_1(node, graph, parent_object, incoming_state, parent_incomplete_triples)
 	else :
 		_parse_1_0(node, graph, parent_object, incoming_state, parent_incomplete_triples)
@@ -226,7 +233,7 @@ def _parse_1_1(node, graph, parent_object, incoming_state, parent_incomplete_tri
 	## The possible typeof indicates a number of type statements on the typed resource
 	for defined_type in state.getURI("typeof") :
 		if typed_resource :
-			graph.add((typed_resource, ns_rdf["type"], defined_type))
+			graph.add((typed_resource, rdf_type, defined_type))
 
 	# ---------------------------------------------------------------------
 	# In case of @rel/@rev, either triples or incomplete triples are generated
@@ -306,12 +313,12 @@ def _parse_1_1(node, graph, parent_object, incoming_state, parent_incomplete_tri
 			if vals == None :
 				# This was an empty list, in fact, ie, the list has been initiated by a <xxx rel="prop" inlist>
 				# but no list content has ever been added
-				graph.add( (state.get_list_origin(), prop, ns_rdf["nil"]) )
+				graph.add( (state.get_list_origin(), prop, rdf_nil) )
 			else :
-				heads = [ BNode() for r in vals ] + [ ns_rdf["nil"] ]
+				heads = [ BNode() for r in vals ] + [ rdf_nil ]
 				for i in range(0, len(vals)) :
-					graph.add( (heads[i], ns_rdf["first"], vals[i]) )
-					graph.add( (heads[i], ns_rdf["rest"],  heads[i+1]) )
+					graph.add( (heads[i], rdf_first, vals[i]) )
+					graph.add( (heads[i], rdf_rest,  heads[i+1]) )
 				# Anchor the list
 				graph.add( (state.get_list_origin(), prop, heads[0]) )
 
@@ -422,7 +429,7 @@ def _parse_1_0(node, graph, parent_object, incoming_state, parent_incomplete_tri
 	# ---------------------------------------------------------------------
 	## The possible typeof indicates a number of type statements on the new Subject
 	for defined_type in state.getURI("typeof") :
-		graph.add((current_subject, ns_rdf["type"], defined_type))
+		graph.add((current_subject, rdf_type, defined_type))
 
 	# ---------------------------------------------------------------------
 	# In case of @rel/@rev, either triples or incomplete triples are generated
@@ -503,9 +510,8 @@ def handle_role_attribute(node, graph, state) :
 			subject = URIRef(state.base + '#' + id)
 		else :
 			subject = BNode()
-		predicate = URIRef('http://www.w3.org/1999/xhtml/vocab#role')
 		for object in state.getURI("role") :
-			graph.add((subject, predicate, object))
+			graph.add((subject, xhv_role, object))
 	
 	
 	
@@ -68,7 +68,7 @@ class ProcessProperty :
 		"""
 		Common entry point for the RDFa 1.0 and RDFa 1.1 versions; bifurcates based on the RDFa version, as retrieved from the state object.
 		"""
-		if self.state.rdfa_version >= "1.1" :
+		if self.state.rdfa_11 :
 			self.generate_1_1()
 		else :
 			self.generate_1_0()
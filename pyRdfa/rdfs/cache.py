@@ -66,8 +66,10 @@ def _load(fname) :
 	Load a cached file and return the resulting object
 	@param fname: file name
 	"""
+	# Pickle data is binary (except for protocol 0); the file must be opened accordingly, otherwise
+	# the on-disc cache cannot be used with Python 3
+	f = open(fname, "rb")
 	try :
-		f = open(fname)
 		return pickle.load(f)
 	finally :
 		f.close()
@@ -78,8 +80,8 @@ def _dump(obj, fname) :
 	@param obj: Python object to store
 	@param fname: file name
 	"""
+	f = open(fname, "wb")
 	try :
-		f = open(fname, "w")
 		pickle.dump(obj, f, _Pickle_Protocol)
 		f.flush()
 	finally :
@@ -236,8 +238,9 @@ class CachedVocab(CachedVocabIndex) :
 	@ivar expiration_date: expiration date of the cache
 	@type expiration_date: datetime
 	@cvar runtime_cache : a run time cache for already 'seen' vocabulary files. Apart from (marginally) speeding up processing, this also prevents recursion
-	@type runtime_cache : dictionary
+	@type runtime_cache : dictionary, mapping URI-s to (filename, creation date, expiration date, graph) tuples
 	"""
+	runtime_cache = {}
 	def __init__(self, URI, options = None) :
 		"""
 		@param URI: real URI for the vocabulary file
@@ -250,6 +253,16 @@ class CachedVocab(CachedVocabIndex) :
 		(self.filename, self.creation_date, self.expiration_date)	= ("",None,None)
 		self.graph													= Graph()
 
+		if URI in CachedVocab.runtime_cache and (options == None or options.refresh_vocab_cache == False) :
+			(filename, creation_date, expiration_date, graph) = CachedVocab.runtime_cache[URI]
+			if datetime.datetime.utcnow() <= expiration_date :
+				# The vocabulary has already been seen in this run, no need to go through the index and the disc again
+				(self.filename, self.creation_date, self.expiration_date, self.graph) = (filename, creation_date, expiration_date, graph)
+				self.options = options
+				self.report  = (options != None) and options.vocab_cache_report
+				if self.report: options.add_info("Vocabulary %s has already been used in this run; reusing it" % URI, VocabCachingInfo)
+				return
+
 		try :
 			CachedVocabIndex.__init__(self, options)
 			vocab_reference 	= self.get_ref(URI)
@@ -313,6 +326,9 @@ class CachedVocab(CachedVocabIndex) :
 					
 				self._store_caches()
 
+		if self.graph != None and self.expiration_date != None :
+			CachedVocab.runtime_cache[URI] = (self.filename, self.creation_date, self.expiration_date, self.graph)
+
 	def _get_vocab_data(self, newCache = True) :
 		"""Just a macro like function to get the data to be cached"""		
 		from pyRdfa.rdfs.process import return_graph
@@ -14,6 +14,7 @@ $Id: process.py,v 1.7 2012-03-23 14:06:38 ivan Exp $ $Date: 2012-03-23 14:06:38
 
 import sys
 import os
+from io import BytesIO
 
 import rdflib
 from rdflib	import URIRef
@@ -45,17 +46,30 @@ from . import err_unrecognised_vocab_type
 
 from .. import VocabReferenceError
 
-from .cache import CachedVocab
+from .cache import CachedVocab, xml_application_media_type
 from .. import HTTPError, RDFaError
 
 #############################################################################################################
 
+# Vocabulary media types that RDFLib can parse directly, mapped to the RDFLib parser format and to the error message
+# used if the parsing fails
+vocab_parsers = {
+	MediaTypes.turtle	: ("n3",  err_unparsable_Turtle_vocab),
+	MediaTypes.rdfxml	: ("xml", err_unparsable_xml_vocab),
+	MediaTypes.nt		: ("nt",  err_unparsable_ntriples_vocab),
+	MediaTypes.ntriples	: ("nt",  err_unparsable_ntriples_vocab),
+}
+
+# Vocabulary media types that need a separate RDFa processing (as well as any application/xxx+xml media type)
+rdfa_media_types = frozenset([MediaTypes.xhtml, MediaTypes.html, MediaTypes.xml])
+
+
 def return_graph(uri, options, newCache = False) :
 	"""Parse a file, and return an RDFLib Graph. The URI's content type is checked and either one of
 	RDFLib's parsers is invoked (for the Turtle, RDF/XML, and N Triple cases) or a separate RDFa processing is invoked
 	on the RDFa content.
 			
-	The Accept header of the HTTP request gives a preference to Turtle, followed by RDF/XML and then HTML (RDFa), in case content negotiation is used.
+	The Accept header of the HTTP request gives a preference to N-Triples and Turtle (N-Triples is the cheapest to parse), followed by RDF/XML and then HTML (RDFa), in case content negotiation is used.
 	
 	This function is used to retreive the vocabulary file and turn it into an RDFLib graph.
 	
@@ -76,7 +90,7 @@ def return_graph(uri, options, newCache = False) :
 	
 	try :
 		content = URIOpener(uri,
-							{'Accept' : 'text/html;q=0.8, application/xhtml+xml;q=0.8, text/turtle;q=1.0, application/rdf+xml;q=0.9'})
+							{'Accept' : 'text/html;q=0.8, application/xhtml+xml;q=0.8, application/n-triples;q=1.0, text/turtle;q=1.0, application/rdf+xml;q=0.9'})
 	except HTTPError :
 		(type,value,traceback) = sys.exc_info()
 		return_to_cache(value)
@@ -92,39 +106,27 @@ def return_graph(uri, options, newCache = False) :
 	
 	# Store the expiration date of the newly accessed data
 	expiration_date = content.expiration_date
-					
-	if content.content_type == MediaTypes.turtle :
-		try :
-			retval = Graph()
-			retval.parse(content.data, format="n3")
-		except :
-			(type,value,traceback) = sys.exc_info()
-			options.add_warning(err_unparsable_Turtle_vocab % (uri,value))
-	elif content.content_type == MediaTypes.rdfxml :
-		try :
-			retval = Graph()
-			retval.parse(content.data)
-		except :
-			(type,value,traceback) = sys.exc_info()
-			options.add_warning(err_unparsable_Turtle_vocab % (uri,value))
-	elif content.content_type == MediaTypes.nt :
+
+	content_type = content.content_type
+	if content_type in vocab_parsers :
+		(format, err_unparsable) = vocab_parsers[content_type]
 		try :
 			retval = Graph()
-			retval.parse(content.data, format="nt")
+			# The data is already at hand; passing it explicitly spares RDFLib from guessing whether it is a URI, a file, or a stream
+			retval.parse(data=content.data, format=format)
 		except :
 			(type,value,traceback) = sys.exc_info()
-			options.add_warning(err_unparsable_ntriples_vocab % (uri,value))
-	elif content.content_type in [MediaTypes.xhtml, MediaTypes.html, MediaTypes.xml] or xml_application_media_type.match(content.content_type) != None :
+			options.add_warning(err_unparsable % (uri,value))
+	elif content_type in rdfa_media_types or xml_application_media_type.match(content_type) != None :
 		try :
 			from pyRdfa import pyRdfa
 			from pyRdfa.options	import Options
-			options = Options()
-			retval = pyRdfa(options).graph_from_source(content.data)
+			retval = pyRdfa(Options(), base=uri, media_type=content_type).graph_from_source(BytesIO(content.data))
 		except :
 			(type,value,traceback) = sys.exc_info()
 			options.add_warning(err_unparsable_rdfa_vocab % (uri,value))
 	else :
-		options.add_warning(err_unrecognised_vocab_type % (uri, content.content_type))
+		options.add_warning(err_unrecognised_vocab_type % (uri, content_type))
 		
 	return (retval, expiration_date)
 	
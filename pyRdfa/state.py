@@ -82,8 +82,12 @@ class ExecutionContext :
 	@type node: DOM node instance
 	@ivar rdfa_version: RDFa version of the content
 	@type rdfa_version: String
+	@ivar rdfa_11: whether the content is processed as RDFa 1.1 (ie, the result of a one-time comparison of L{rdfa_version}, used by the various version dependent tests)
+	@type rdfa_11: Boolean
 	@ivar supress_lang: in some cases, the effect of the lang attribute should be supressed for the given node, although it should be inherited down below (example: @value attribute of the data element in HTML5)
 	@type supress_lang: Boolean
+	@ivar _uri_values: the values already returned by L{getURI}, keyed by the attribute names
+	@type _uri_values: dictionary
 	@cvar _list: list of attributes that allow for lists of values and should be treated as such
 	@cvar _resource_type: dictionary; mapping table from attribute name to the exact method to retrieve the URI(s). Is initialized at first instantiation.
 	"""
@@ -138,6 +142,7 @@ class ExecutionContext :
 			}	
 		#-----------------------------------------------------------------
 		self.node = node
+		self._uri_values = {}
 		
 		#-----------------------------------------------------------------
 		# Settling the base. In a generic XML, xml:base should be accepted at all levels (though this is not the
@@ -146,6 +151,7 @@ class ExecutionContext :
 		# when the <base> element is looked for (for the HTML cases, that is)
 		if inherited_state :
 			self.rdfa_version		= inherited_state.rdfa_version
+			self.rdfa_11			= inherited_state.rdfa_11
 			self.base				= inherited_state.base
 			self.options			= inherited_state.options
 						
@@ -173,6 +179,9 @@ class ExecutionContext :
 					self.rdfa_version = "1.0"
 				elif top_version.find("RDFa 1.1") != -1 or top_version.find("RDFa1.1") != -1 :
 					self.rdfa_version = "1.1"						
+
+			# The version is settled for the whole document; all other nodes simply inherit this value
+			self.rdfa_11 = self.rdfa_version >= "1.1"
 			
 			# this is just to play safe. I believe this should actually not happen...
 			if options == None :
@@ -360,7 +369,7 @@ class ExecutionContext :
 				val = val[1:-1]
 				safe_curie = True
 		# There is a branch here depending on whether we are in 1.1 or 1.0 mode
-		if self.rdfa_version >= "1.1" :
+		if self.rdfa_11 :
 			retval = self.term_or_curie.CURIE_to_URI(val)
 			if retval == None :
 				# the value could not be interpreted as a CURIE, ie, it did not produce any valid URI.
@@ -412,7 +421,7 @@ class ExecutionContext :
 			retval = self.term_or_curie.CURIE_to_URI(val)
 			if retval :
 				return retval
-			elif self.rdfa_version >= "1.1" :
+			elif self.rdfa_11 :
 				# See if it is an absolute URI
 				scheme = urlsplit(val)[0]
 				if scheme == "" :
@@ -439,6 +448,11 @@ class ExecutionContext :
 		@type attr: string
 		@return: an RDFLib URIRef instance (or None) or a list of those
 		"""
+		# The same attributes are often looked at several times while processing a node (eg, @resource or @href
+		# for both the object and the typed resource); the result is the same every time
+		if attr in self._uri_values :
+			return self._uri_values[attr]
+
 		if self.node.hasAttribute(attr) :
 			val = self.node.getAttribute(attr)
 		else :
@@ -461,6 +475,7 @@ class ExecutionContext :
 			retval = [ r for r in resources if r != None ]
 		else :
 			retval = func(self, val.strip())
+		self._uri_values[attr] = retval
 		return retval
 	# end getURI
 	
@@ -13,8 +13,11 @@ U{W3C® SOFTWARE NOTICE AND LICENSE<href="http://www.w3.org/Consortium/Legal/200
 
 @var XHTML_PREFIX: prefix for the XHTML vocabulary URI (set to 'xhv')
 @var XHTML_URI: URI prefix of the XHTML vocabulary
+@var uri_cache_size: maximal number of entries in the CURIE cache of a L{TermOrCurie} instance
 @var ncname: Regular expression object for NCNAME
+@var prefix_name: Regular expression object for a prefix in a C{@prefix} attribute, ie, an NCNAME followed by a ':'
 @var termname: Regular expression object for a term
+@var prefix_declaration: Regular expression object for the (prefix,URI) pairs of a C{@prefix} attribute
 @var xml_application_media_type: Regular expression object for a general XML application media type
 """
 
@@ -25,12 +28,21 @@ $Date: 2013-10-16 11:48:54 $
 
 import re, sys
 import xml.dom.minidom
-import random
 
 if sys.version_info[0] >= 3 :
 	from urllib.parse import urlsplit
+	from sys import intern
+	from collections import ChainMap
 else :	
 	from urlparse import urlsplit
+	# The Python 2 built-in intern does not accept unicode strings, which is what the DOM returns...
+	def intern(s) : return s
+	# There is no ChainMap in Python 2; the dictionaries are simply merged into a new one
+	def ChainMap(local, inherited) :
+		retval = {}
+		retval.update(inherited)
+		retval.update(local)
+		return retval
 
 
 import rdflib
@@ -71,18 +83,136 @@ from . import err_prefix_redefinition
 # Regular expression object for NCNAME
 ncname   = re.compile("^[A-Za-z][A-Za-z0-9._-]*$")
 
+# Regular expression object for a prefix in a @prefix attribute, ie, an NCNAME followed by a ':'
+prefix_name = re.compile("^([A-Za-z][A-Za-z0-9._-]*):$")
+
 # Regular expression object for term name
 termname = re.compile("^[A-Za-z]([A-Za-z0-9._-]|/)*$")
 
+# Regular expression object for the (prefix,URI) pairs of a @prefix attribute; the URI is empty for a trailing prefix without a URI
+prefix_declaration = re.compile(r"(\S+)(?:\s+(\S+))?")
+
 # Regular expression object for a general XML application media type
 xml_application_media_type = re.compile("application/[a-zA-Z0-9]+\+xml")
 
 XHTML_PREFIX = "xhv"
 XHTML_URI    = "http://www.w3.org/1999/xhtml/vocab#"
 
-#### Managing blank nodes for CURIE-s: mapping from local names to blank nodes.
-_bnodes = {}
-_empty_bnode = BNode()
+# Maximal number of entries in the CURIE cache of a L{TermOrCurie} instance; beyond that, the oldest entries are dropped
+uri_cache_size = 5000
+
+#### The XHTML vocabulary as an RDFLib Namespace; it is the default CURIE URI of every document, and Namespace-s are immutable
+_xhv_namespace = Namespace(XHTML_URI)
+
+#### The terms predefined by RDFa 1.0, with the URI-s already turned into RDFLib terms. The dictionary is never modified
+#### after its creation, ie, all documents can share it
+_predefined_1_0_terms = dict([ (key, _xhv_namespace[key]) for key in predefined_1_0_rel ])
+
+#### Initial contexts, with the URI-s already turned into RDFLib terms: mapping from the context id to a (terms,ns) tuple.
+_initial_context_terms = {}
+
+def _get_initial_context_terms(id) :
+	"""
+	Return the terms and the prefixes of an initial context as RDFLib terms. The conversion of the initial context data
+	(which consists of simple strings) is done only once, at first usage; the result is stored in L{_initial_context_terms}
+	and is reused for every subsequent document.
+	@param id: the URI of the initial context
+	@return: a tuple of two dictionaries; the first maps terms to URIRef-s, the second maps prefixes to Namespace-s
+	"""
+	if id not in _initial_context_terms :
+		from .initialcontext import initial_context as context_data
+		data  = context_data[id]
+		terms = {}
+		ns    = {}
+		for key in data.terms :
+			terms[key] = URIRef(data.terms[key])
+		for key in data.ns :
+			ns[key] = Namespace(data.ns[key])
+		_initial_context_terms[id] = (terms, ns)
+	return _initial_context_terms[id]
+
+def _has_xmlns(node) :
+	"""
+	Check whether a node has any C{xmlns:} attribute, ie, whether it defines namespace prefixes that way.
+	@param node: a DOM element node
+	@rtype: Boolean
+	"""
+	return any(name.startswith('xmlns:') for name in node.attributes.keys())
+
+#### Lower case, interned versions of prefixes: the same handful of prefixes is used over and over again in CURIE-s
+#### and prefix declarations, there is no need to create a new string for each occurrence.
+_lower_prefixes = {}
+
+def _lower_prefix(prefix) :
+	"""
+	Return the lower case version of a prefix. The result is interned and stored in L{_lower_prefixes}, ie, the
+	conversion is done only once for each prefix.
+	@param prefix: the prefix string
+	@return: the lower case version of the prefix
+	"""
+	if prefix not in _lower_prefixes :
+		# Documents may use an arbitrary number of different (erroneous) prefixes, let us not collect all of those
+		if len(_lower_prefixes) >= uri_cache_size :
+			_lower_prefixes.clear()
+		_lower_prefixes[prefix] = intern(prefix.lower())
+	return _lower_prefixes[prefix]
+
+#### Namespace instances for the URI-s used in prefix declarations; the same declarations (eg, for foaf or dc) are
+#### typically repeated on many elements and in many documents, there is no need to create a new object each time.
+_namespaces = {}
+
+def _namespace(uri) :
+	"""
+	Return the RDFLib Namespace for a URI. The Namespace instance is created only once for each URI, and is stored
+	in L{_namespaces}.
+	@param uri: the (already quoted) URI string
+	@return: an RDFLib Namespace
+	"""
+	if uri not in _namespaces :
+		if len(_namespaces) >= uri_cache_size :
+			_namespaces.clear()
+		_namespaces[uri] = Namespace(uri)
+	return _namespaces[uri]
+
+#### URIRef-s generated for terms through a @vocab: the pair of the vocabulary URI and the term is the key. The same few
+#### terms are typically used over and over in a document, there is no need to generate (and check) a new URIRef every time.
+_vocab_terms = {}
+
+def _merge(local, inherited) :
+	"""
+	Merge locally defined mappings (eg, prefixes) with the inherited ones, the local ones having priority. Nothing is
+	copied: if there are no local definitions, the inherited mapping is used as is, otherwise the local mapping is put
+	in front of the inherited one.
+	@param local: the locally defined mapping
+	@type local: dictionary
+	@param inherited: the inherited mapping; None on the top level
+	@return: the merged mapping
+	"""
+	if inherited is None :
+		return local
+	elif len(local) == 0 :
+		return inherited
+	else :
+		return ChainMap(local, inherited)
+
+#### The list of URI schemes is defined in the package's __init__ which, in its turn, imports this module; the list
+#### can therefore be picked up only at first usage.
+_uri_schemes = None
+
+def _check_prefix(pr, state) :
+	"""
+	Check whether a prefix being defined is also a URI scheme; a warning is issued if it is.
+	@param pr: the prefix
+	@param state: the current state
+	@type state: L{state.ExecutionContext}
+	"""
+	global _uri_schemes
+	if _uri_schemes is None :
+		from . import uri_schemes
+		_uri_schemes = uri_schemes
+	if pr in _uri_schemes :
+		# The prefix being defined is a registered URI scheme, better avoid it...
+		state.options.add_warning(err_redefining_URI_as_prefix % pr, node=state.node.nodeName)
 
 ####
 
@@ -116,7 +246,7 @@ class InitialContext :
 		# Default vocabulary
 		self.vocabulary = None
 		
-		if state.rdfa_version < "1.1" or top_level == False :
+		if not state.rdfa_11 or top_level == False :
 			return
 		
 		from .initialcontext	import initial_context    as context_data
@@ -133,10 +263,12 @@ class InitialContext :
 			elif data.vocabulary != "" :
 				self.vocabulary = data.vocabulary
 
-			for key in data.terms :
-				self.terms[key] = URIRef(data.terms[key])
-			for key in data.ns :
-				self.ns[key] = (Namespace(data.ns[key]),False)
+			(terms, ns) = _get_initial_context_terms(id)
+			for key in terms :
+				self.terms[key] = terms[key]
+			# The flag is used for lazy binding, ie, it is set per document
+			for key in ns :
+				self.ns[key] = (ns[key],False)
 
 
 ##################################################################################################################
@@ -159,10 +291,24 @@ class TermOrCurie :
 	@type graph: rdflib.Graph
 	@ivar terms: mapping from terms to URI-s
 	@type terms: dictionary
+	@ivar _terms_lc: mapping from the lower case version of the terms to URI-s, used for the case insensitive matching of terms
+	@type _terms_lc: dictionary
 	@ivar ns: namespace declarations, ie, mapping from prefixes to URIs
 	@type ns: dictionary
 	@ivar default_curie_uri: URI for a default CURIE
+	@ivar _uri_cache: cache of the URI-s generated for CURIE-s, keyed by the CURIE-s themselves; shared by all instances with the same namespace declarations
+	@type _uri_cache: dictionary
+	@ivar _bnodes: mapping from the local names of blank node CURIE-s to blank nodes; shared by all instances of the same document
+	@type _bnodes: dictionary
+	@ivar _empty_bnode: blank node for the "_:" CURIE; shared by all instances of the same document
+	@type _empty_bnode: rdflib.BNode
+	@ivar _bound_prefixes: prefixes already bound (lazily) in the output graph; shared by all instances of the same document
+	@type _bound_prefixes: set
 	"""
+	# One instance is created for each element; a fixed attribute layout avoids a separate instance dictionary for each of those
+	__slots__ = ('state', 'graph', 'default_curie_uri', 'default_term_uri', 'default_prefixes', 'terms', '_terms_lc',
+				 'ns', 'xmlns', '_uri_cache', '_bnodes', '_empty_bnode', '_bound_prefixes')
+
 	def __init__(self, state, graph, inherited_state) :
 		"""Initialize the vocab bound to a specific state. 
 		@param state: the state to which this vocab instance belongs to
@@ -172,33 +318,62 @@ class TermOrCurie :
 		@param inherited_state: the state inherited by the current state. 'None' if this is the top level state.
 		@type inherited_state: L{state.ExecutionContext}
 		"""
-		def check_prefix(pr) :
-			from . import uri_schemes
-			if pr in uri_schemes :
-				# The prefix being defined is a registered URI scheme, better avoid it...
-				state.options.add_warning(err_redefining_URI_as_prefix % pr, node=state.node.nodeName)
-				
 		self.state	= state
 		self.graph	= graph
+
+		# --------------------------------------------------------------------------------
+		# The vast majority of the elements do not change the vocabulary settings at all; everything can then be
+		# taken over by reference from the parent, without going through all the details below
+		top_level = inherited_state is None
+		has_xmlns = _has_xmlns(state.node)
+		if not top_level and not has_xmlns and not state.node.hasAttribute("prefix") and not state.node.hasAttribute("vocab") :
+			inherited = inherited_state.term_or_curie
+			self.default_curie_uri = inherited.default_curie_uri
+			self.default_term_uri  = inherited.default_term_uri
+			self.default_prefixes  = inherited.default_prefixes
+			self.terms             = inherited.terms
+			self._terms_lc         = inherited._terms_lc
+			self.ns                = inherited.ns
+			self.xmlns             = inherited.xmlns
+			self._uri_cache        = inherited._uri_cache
+			self._bnodes           = inherited._bnodes
+			self._empty_bnode      = inherited._empty_bnode
+			self._bound_prefixes   = inherited._bound_prefixes
+			return
+
+		# Used in many tests below
+		rdfa_11 = state.rdfa_11
 		
 		# --------------------------------------------------------------------------------
-		# This is set to non-void only on the top level and in the case of 1.1
-		default_vocab = InitialContext(self.state, inherited_state == None)
+		# This is set to non-void only on the top level and in the case of 1.1; RDFa 1.0 has no initial context
+		# whatsoever, ie, there is no need to create one
+		if rdfa_11 :
+			default_vocab = InitialContext(self.state, top_level)
+		else :
+			default_vocab = None
 		
 		# Set the default CURIE URI
-		if inherited_state == None :
+		if top_level :
 			# This is the top level...
-			self.default_curie_uri = Namespace(XHTML_URI)
+			self.default_curie_uri = _xhv_namespace
 			# self.graph.bind(XHTML_PREFIX, self.default_curie_uri)
+			# Blank nodes for CURIE-s, as well as the record of lazily bound prefixes, are local to a document, ie, are
+			# set up here and taken over by all descendants
+			self._bnodes          = {}
+			self._empty_bnode     = BNode()
+			self._bound_prefixes  = set()
 		else :
 			self.default_curie_uri = inherited_state.term_or_curie.default_curie_uri
+			self._bnodes           = inherited_state.term_or_curie._bnodes
+			self._empty_bnode      = inherited_state.term_or_curie._empty_bnode
+			self._bound_prefixes   = inherited_state.term_or_curie._bound_prefixes
 		
 		# --------------------------------------------------------------------------------
 		# Set the default term URI
 		# This is a 1.1 feature, ie, should be ignored if the version is < 1.0
-		if state.rdfa_version >= "1.1" :
+		if rdfa_11 :
 			# that is the absolute default setup...
-			if inherited_state == None :
+			if top_level :
 				self.default_term_uri = None
 			else :
 				self.default_term_uri = inherited_state.term_or_curie.default_term_uri
@@ -216,141 +391,140 @@ class TermOrCurie :
 				def_term_uri = self.state.getURI("vocab")
 				if def_term_uri and def_term_uri != "" :			
 					self.default_term_uri = def_term_uri
-					self.graph.add((URIRef(self.state.base),RDFA_VOCAB,URIRef(def_term_uri)))
+					# getURI returns a URIRef already, no need to wrap it again
+					self.graph.add((URIRef(self.state.base),RDFA_VOCAB,def_term_uri))
 		else :
 			self.default_term_uri = None
 		
 		# --------------------------------------------------------------------------------
 		# The simpler case: terms, adding those that have been defined by a possible initial context
-		if inherited_state is None :
+		if top_level :
 			# this is the vocabulary belonging to the top level of the tree!
-			self.terms = {}
-			if state.rdfa_version >= "1.1" :
-				# Simply get the terms defined by the default vocabularies. There is no need for merging
-				for key in default_vocab.terms :
-					self.terms[key] = default_vocab.terms[key]
+			if rdfa_11 :
+				# Simply get the terms defined by the default vocabularies. There is no need for merging, and
+				# the dictionary has been created for this very document, ie, it can be taken over by reference
+				self.terms = default_vocab.terms
 			else :
 				# The terms are hardwired...
-				for key in predefined_1_0_rel :
-					self.terms[key] = URIRef(XHTML_URI + key)
+				self.terms = _predefined_1_0_terms
+			# Terms are also matched case insensitively; a lower case version of the keys spares a search through all the terms
+			self._terms_lc = {}
+			for key in self.terms :
+				self._terms_lc.setdefault(key.lower(), self.terms[key])
 		else :
 			# just refer to the inherited terms
-			self.terms = inherited_state.term_or_curie.terms
+			self.terms     = inherited_state.term_or_curie.terms
+			self._terms_lc = inherited_state.term_or_curie._terms_lc
 
 		#-----------------------------------------------------------------
 		# the locally defined namespaces
-		dict = {}
+		local_ns = {}
 		# locally defined xmlns namespaces, necessary for correct XML Literal generation
 		xmlns_dict = {}
 
-		# Add the locally defined namespaces using the xmlns: syntax
-		for i in range(0, state.node.attributes.length) :
-			attr = state.node.attributes.item(i)
-			if attr.name.find('xmlns:') == 0 :	
-				# yep, there is a namespace setting
-				prefix = attr.localName
-				if prefix != "" : # exclude the top level xmlns setting...
-					if state.rdfa_version >= "1.1" and state.options.host_language in warn_xmlns_usage :
-						state.options.add_warning(err_xmlns_deprecated % prefix, IncorrectPrefixDefinition, node=state.node.nodeName)
-					if prefix == "_" :
-						state.options.add_warning(err_bnode_local_prefix, IncorrectPrefixDefinition, node=state.node.nodeName)
-					elif prefix.find(':') != -1 :
-						state.options.add_warning(err_col_local_prefix % prefix, IncorrectPrefixDefinition, node=state.node.nodeName)
-					else :					
-						# quote the URI, ie, convert special characters into %.. This is
-						# true, for example, for spaces
-						uri = quote_URI(attr.value, state.options)
-						# create a new RDFLib Namespace entry
-						ns = Namespace(uri)
-						# Add an entry to the dictionary if not already there (priority is left to right!)
-						if state.rdfa_version >= "1.1" :
-							pr = prefix.lower()
-						else :
-							pr = prefix
-						dict[pr]       = ns
-						xmlns_dict[pr] = ns
-						self.graph.bind(pr,ns)
-						check_prefix(pr)
+		# Add the locally defined namespaces using the xmlns: syntax; no need to look at the attributes one by one if
+		# it is already known that there is none
+		if has_xmlns :
+			for attr in state.node.attributes.values() :
+				if attr.name.startswith('xmlns:') :	
+					# yep, there is a namespace setting
+					prefix = attr.localName
+					if prefix != "" : # exclude the top level xmlns setting...
+						if rdfa_11 and state.options.host_language in warn_xmlns_usage :
+							state.options.add_warning(err_xmlns_deprecated % prefix, IncorrectPrefixDefinition, node=state.node.nodeName)
+						if prefix == "_" :
+							state.options.add_warning(err_bnode_local_prefix, IncorrectPrefixDefinition, node=state.node.nodeName)
+						elif ':' in prefix :
+							state.options.add_warning(err_col_local_prefix % prefix, IncorrectPrefixDefinition, node=state.node.nodeName)
+						else :					
+							# quote the URI, ie, convert special characters into %.. This is
+							# true, for example, for spaces
+							uri = quote_URI(attr.value, state.options)
+							# create a new RDFLib Namespace entry
+							ns = _namespace(uri)
+							# Add an entry to the dictionary if not already there (priority is left to right!)
+							if rdfa_11 :
+								pr = _lower_prefix(prefix)
+							else :
+								pr = intern(prefix)
+							local_ns[pr]   = ns
+							xmlns_dict[pr] = ns
+							self.graph.bind(pr,ns)
+							_check_prefix(pr, state)
 
 		# Add the locally defined namespaces using the @prefix syntax
 		# this may override the definition @xmlns
-		if state.rdfa_version >= "1.1" and state.node.hasAttribute("prefix") :
+		if rdfa_11 and state.node.hasAttribute("prefix") :
 			pr = state.node.getAttribute("prefix")
 			if pr != None :
-				# separator character is whitespace
-				pr_list = pr.strip().split()
-				# range(0, len(pr_list), 2) 
-				for i in range(len(pr_list) - 2, -1, -2) :
-					prefix = pr_list[i]
+				# separator character is whitespace; the pairs are processed from right to left, ie, the leftmost
+				# definition of a prefix has priority
+				for (prefix, value) in reversed(prefix_declaration.findall(pr)) :
 					# see if there is a URI at all
-					if i == len(pr_list) - 1 :
+					if value == "" :
 						state.options.add_warning(err_missing_URI_prefix % (prefix,pr), node=state.node.nodeName)
-						break
-					else :
-						value = pr_list[i+1]
+						continue
 					
+					# The usual case first: the prefix is an NCNAME followed by a ':'; one regular expression checks both
+					match = prefix_name.match(prefix)
+					if match :
+						prefix      = match.group(1)
+						uri         = _namespace(quote_URI(value, state.options))
+						real_prefix = _lower_prefix(prefix)
+						local_ns[real_prefix] = uri
+						self.graph.bind(real_prefix,uri)
+						# Additional warning: is this prefix overriding an existing xmlns statement with a different URI? if
+						# so, that may lead to discrepancies between an RDFa 1.0 and RDFa 1.1 run...
+						if (prefix in xmlns_dict and xmlns_dict[prefix] != uri) or (real_prefix in xmlns_dict and xmlns_dict[real_prefix] != uri) :
+							state.options.add_warning(err_prefix_and_xmlns % (real_prefix,real_prefix), node=state.node.nodeName)
+						_check_prefix(real_prefix, state)
+					# Something is wrong; find out what, to issue the right warning
 					# see if the value of prefix is o.k., ie, there is a ':' at the end
-					if prefix[-1] != ':' :
+					elif prefix[-1] != ':' :
 						state.options.add_warning(err_invalid_prefix % (prefix,pr), IncorrectPrefixDefinition, node=state.node.nodeName)
-						continue
 					elif prefix == ":" :
 						state.options.add_warning(err_no_default_prefix % pr, IncorrectPrefixDefinition, node=state.node.nodeName)
-						continue						
 					else :
 						prefix = prefix[:-1]
-						uri    = Namespace(quote_URI(value, state.options))
+						uri    = _namespace(quote_URI(value, state.options))
 						if prefix == "" :
 							#something to be done here
 							self.default_curie_uri = uri
 						elif prefix == "_" :
 							state.options.add_warning(err_bnode_local_prefix, IncorrectPrefixDefinition, node=state.node.nodeName)
 						else :
-							# last check: is the prefix an NCNAME?
-							if ncname.match(prefix) :
-								real_prefix = prefix.lower()
-								dict[real_prefix] = uri
-								self.graph.bind(real_prefix,uri)
-								# Additional warning: is this prefix overriding an existing xmlns statement with a different URI? if
-								# so, that may lead to discrepancies between an RDFa 1.0 and RDFa 1.1 run...
-								if (prefix in xmlns_dict and xmlns_dict[prefix] != uri) or (real_prefix in xmlns_dict and xmlns_dict[real_prefix] != uri) :
-									state.options.add_warning(err_prefix_and_xmlns % (real_prefix,real_prefix), node=state.node.nodeName)
-								check_prefix(real_prefix)
-
-							else :
-								state.options.add_warning(err_non_ncname_prefix % (prefix,pr), IncorrectPrefixDefinition, node=state.node.nodeName)
+							# not an NCNAME
+							state.options.add_warning(err_non_ncname_prefix % (prefix,pr), IncorrectPrefixDefinition, node=state.node.nodeName)
 
 		# See if anything has been collected at all.
 		# If not, the namespaces of the incoming state is
 		# taken over by reference. Otherwise that is copied to the
 		# the local dictionary
-		if inherited_state == None :
-			self.default_prefixes = default_vocab.ns
-			inherited_prefixes    = {}
+		if top_level :
+			if rdfa_11 :
+				self.default_prefixes = default_vocab.ns
+			else :
+				self.default_prefixes = {}
+			inherited_prefixes    = None
+			inherited_xmlns       = None
 		else :
 			self.default_prefixes = inherited_state.term_or_curie.default_prefixes
 			inherited_prefixes    = inherited_state.term_or_curie.ns
+			inherited_xmlns       = inherited_state.term_or_curie.xmlns
 
-		if len(dict) == 0 :
-			self.ns = inherited_prefixes
+		# The cache of resolved CURIE-s is valid as long as the prefix mappings are the same, ie,
+		# it goes hand in hand with the namespace dictionary
+		if len(local_ns) == 0 and not top_level :
+			self._uri_cache = inherited_state.term_or_curie._uri_cache
 		else :
-			self.ns = {}
-			for key in inherited_prefixes : self.ns[key] = inherited_prefixes[key]
-			for key in dict : 
-				if (key in inherited_prefixes and dict[key] != inherited_prefixes[key]) or (key in self.default_prefixes and dict[key] != self.default_prefixes[key][0]) :
+			self._uri_cache = {}
+			for key in local_ns : 
+				if (inherited_prefixes is not None and key in inherited_prefixes and local_ns[key] != inherited_prefixes[key]) or (key in self.default_prefixes and local_ns[key] != self.default_prefixes[key][0]) :
 					state.options.add_warning(err_prefix_redefinition % key, PrefixRedefinitionWarning, node=state.node.nodeName)
-				self.ns[key] = dict[key]
+		self.ns = _merge(local_ns, inherited_prefixes)
 
-		
 		# the xmlns prefixes have to be stored separately, again for XML Literal generation	
-		self.xmlns = {}
-		if len(xmlns_dict) == 0 and inherited_state :
-			self.xmlns = inherited_state.term_or_curie.xmlns
-		else :
-			if inherited_state :
-				for key in inherited_state.term_or_curie.xmlns	: self.xmlns[key] = inherited_state.term_or_curie.xmlns[key]
-				for key in xmlns_dict							: self.xmlns[key] = xmlns_dict[key]
-			else :
-				self.xmlns = xmlns_dict
+		self.xmlns = _merge(xmlns_dict, inherited_xmlns)
 	# end __init__
 
 	def _check_reference(self, val) :
@@ -359,11 +533,11 @@ class TermOrCurie :
 		"""
 		def char_check(s, not_allowed = ['#','[',']']) :
 			for c in not_allowed :
-				if s.find(c) != -1 : return False
+				if c in s : return False
 			return True
 		# Creating an artificial http URI to fool the urlparse module...
 		scheme, netloc, url, query, fragment = urlsplit('http:' + val)
-		if netloc != "" and self.state.rdfa_version >= "1.1" :
+		if netloc != "" and self.state.rdfa_11 :
 			self.state.options.add_warning(err_absolute_reference % (netloc, val), UnresolvableReference, node=self.state.node.nodeName)
 			return False
 		elif not char_check(query) :
@@ -387,6 +561,10 @@ class TermOrCurie :
 		@type val: string
 		@return: URIRef of a URI or None.
 		"""
+		# The same CURIE-s are usually used over and over again in a document
+		if val in self._uri_cache :
+			return self._uri_cache[val]
+
 		# Just to be on the safe side:
 		if val == "" :
 			return None
@@ -397,16 +575,13 @@ class TermOrCurie :
 				return None
 		
 		# See if this is indeed a valid CURIE, ie, it can be split by a colon
-		curie_split = val.split(':',1)
-		if len(curie_split) == 1 :
+		(prefix, colon, reference) = val.partition(':')
+		if not colon :
 			# there is no ':' character in the string, ie, it is not a valid CURIE
 			return None
 		else :
-			if self.state.rdfa_version >= "1.1" :
-				prefix	= curie_split[0].lower()
-			else :
-				prefix	= curie_split[0]
-			reference = curie_split[1]
+			if self.state.rdfa_11 :
+				prefix	= _lower_prefix(prefix)
 
 			#if len(reference) > 0 :
 			#	if self.state.rdfa_version >= "1.1" and (len(prefix) == 0 or prefix in self.ns) and reference.startswith('//') :
@@ -417,49 +592,55 @@ class TermOrCurie :
 			#		return None
 			
 			# first possibility: empty prefix
-			if len(prefix) == 0 :
+			if not prefix :
 				if self.default_curie_uri and self._check_reference(reference) :
-					return self.default_curie_uri[reference]
+					# Simple concatenation; this avoids going through the Namespace machinery for each URI
+					return URIRef(self.default_curie_uri + reference)
 				else :
 					return None
 			else :
 				# prefix is non-empty; can be a bnode
 				if prefix == "_" :
 					# yep, BNode processing. There is a difference whether the reference is empty or not...
-					if len(reference) == 0 :
-						return _empty_bnode
+					if not reference :
+						return self._empty_bnode
 					else :
-						# see if this variable has been used before for a BNode
-						if reference in _bnodes :
-							return _bnodes[reference]
-						else :
+						# see if this variable has been used before for a BNode; one lookup is enough for the usual case
+						retval = self._bnodes.get(reference)
+						if retval is None :
 							# a new bnode...
 							retval = BNode()
-							_bnodes[reference] = retval
-							return retval
+							self._bnodes[reference] = retval
+						return retval
 				# check if the prefix is a valid NCNAME
 				elif ncname.match(prefix) :
 					# see if there is a binding for this:					
 					if prefix in self.ns and self._check_reference(reference) :
 						# yep, a binding has been defined!
-						if len(reference) == 0 :
-							return URIRef(str(self.ns[prefix]))
+						if not reference :
+							retval = URIRef(str(self.ns[prefix]))
 						else :
-							return self.ns[prefix][reference]
+							retval = URIRef(self.ns[prefix] + reference)
 					elif prefix in self.default_prefixes and self._check_reference(reference) :
 						# this has been defined through the default context
-						if len(reference) == 0 :
-							return URIRef(str(self.default_prefixes[prefix][0]))
+						if not reference :
+							retval = URIRef(str(self.default_prefixes[prefix][0]))
 						else :
 							(ns,used) = self.default_prefixes[prefix]
 							# lazy binding of prefixes (to avoid unnecessary prefix definitions in the serializations at the end...)
 							if not used :
 								self.graph.bind(prefix,ns)
 								self.default_prefixes[prefix] = (ns,True)
-							return ns[reference]
+							retval = URIRef(ns + reference)
 					else :
 						# no definition for this thing...
 						return None
+					# Only successful mappings are cached: the failed ones must generate their warnings each time. Blank
+					# nodes are not cached either, they have their own mapping
+					if len(self._uri_cache) >= uri_cache_size :
+						del self._uri_cache[next(iter(self._uri_cache))]
+					self._uri_cache[val] = retval
+					return retval
 				else :
 					return None
 	# end CURIE_to_URI
@@ -477,23 +658,27 @@ class TermOrCurie :
 			
 			# First of all, a @vocab nukes everything. That has to be done first...
 			if self.default_term_uri != None :
-				return URIRef(self.default_term_uri + term)
+				key = (self.default_term_uri, term)
+				uri = _vocab_terms.get(key)
+				if uri == None :
+					if len(_vocab_terms) >= uri_cache_size :
+						_vocab_terms.clear()
+					uri = _vocab_terms[key] = URIRef(self.default_term_uri + term)
+				return uri
 
 			# For default terms, the algorithm is (see 7.4.3 of the document): first make a case sensitive match;
-			# if that fails than make a case insensive one			
+			# if that fails than make a case insensive one. Each test is a single dictionary access.
 			# 1. simple, case sensitive test:
-			if term in self.terms :
-				# yep, term is a valid key as is
-				# lazy binding of the xhv prefix for terms...
-				self.graph.bind(XHTML_PREFIX, XHTML_URI)
-				return self.terms[term]
-				
+			uri = self.terms.get(term)
 			# 2. case insensitive test
-			for defined_term in self.terms :
-				if term.lower() == defined_term.lower() :
-					# lazy binding of the xhv prefix for terms...
+			if uri == None :
+				uri = self._terms_lc.get(term.lower())
+			if uri != None :
+				# lazy binding of the xhv prefix for terms; once per document is enough
+				if XHTML_PREFIX not in self._bound_prefixes :
 					self.graph.bind(XHTML_PREFIX, XHTML_URI)
-					return self.terms[defined_term]
+					self._bound_prefixes.add(XHTML_PREFIX)
+				return uri
 
 		# If it got here, it is all wrong...
 		return None
@@ -48,7 +48,7 @@ def top_about(root, options, state) :
 			root.setAttribute("about","")
 		
 	if options.host_language in [ HostLanguage.xhtml, HostLanguage.html5, HostLanguage.xhtml5 ] :
-		if state.rdfa_version >= "1.1" :
+		if state.rdfa_11 :
 			pass
 		else :
 			for top in root.getElementsByTagName("head") :
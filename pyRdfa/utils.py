@@ -16,7 +16,7 @@ U{W3C® SOFTWARE NOTICE AND LICENSE<href="http://www.w3.org/Consortium/Legal/200
 $Id: utils.py,v 1.18 2016/12/08 10:13:34 ivan Exp $
 $Date: 2016/12/08 10:13:34 $
 """
-import os, os.path, sys, datetime, socket
+import os, os.path, sys, datetime, socket, re
 
 # Python 3 vs. 2 switch
 if sys.version_info[0] >= 3 :
@@ -41,14 +41,76 @@ else :
 
 from .host import HostLanguage, preferred_suffixes
 
+# The package's __init__ defines these before it imports this module, ie, there is no circular import problem here
+from . import RDFaError, HTTPError
+from . import err_unusual_char_in_URI
+
 #########################################################################################################
 # Handling URIs
+
+# The HTTP session shared by all L{URIOpener} instances; this keeps the connections alive, ie, repeated accesses
+# to the same host (typically, for vocabularies) do not go through a new connection setup every time
+_session = None
+
+# Number of hosts, and of connections per host, kept in the pool of the shared HTTP session
+session_pool_size = 20
+
+def _get_session() :
+	"""
+	Return the HTTP session shared by all L{URIOpener} instances, creating it at first usage.
+	@return: a requests Session instance
+	"""
+	global _session
+	if _session is None :
+		import requests
+		from requests.adapters import HTTPAdapter
+		_session = requests.Session()
+		# Keep a few connections per host open: vocabularies are typically retrieved from a small number of hosts
+		for scheme in ['http://', 'https://'] :
+			_session.mount(scheme, HTTPAdapter(pool_connections=session_pool_size, pool_maxsize=session_pool_size))
+		# Switching off the verification is not cool. But, at least for now, too many
+		# sites still go wrong because the certificates are not o.k. with request...
+		_session.verify = False
+	return _session
+
+# Servers return the very same few Content-Type header values over and over; the parsed (media type, charset) pair is
+# stored, keyed by the raw header value, so that the header parser runs only once for each of those
+_content_types = {}
+
+def _media_type_and_charset(header) :
+	"""
+	Interpret the value of a Content-Type header.
+	@param header: the raw header value
+	@return: a tuple of the media type (without parameters) and the charset (None if not set)
+	"""
+	if header not in _content_types :
+		if len(_content_types) >= 100 :
+			# A misbehaving server could generate lots of different values (eg, with boundary parameters); keep the store small
+			_content_types.clear()
+		if ';' not in header and header.count('/') == 1 :
+			# No parameters, ie, no charset either: there is no need to go through the full header parser
+			_content_types[header] = (header.strip().lower(), None)
+		else :
+			# The call below will remove the possible media type parameters, like charset settings
+			ct = content_type(header)
+			_content_types[header] = (ct.media_type, ct.parmdict.get('charset'))
+	return _content_types[header]
+
+# Responses that came with a validator (ETag or Last-Modified), keyed by the URL and the Accept header of the request. A new
+# access to the same resource is then a conditional request, and if the server answers with a 304 (Not Modified)
+# the data is taken from here. The oldest entry is dropped when the store is full.
+_validated_responses		= {}
+_validated_responses_size	= 50
+
 class URIOpener :
 	"""A wrapper around the urllib2 method to open a resource. Beyond accessing the data itself, the class
 	sets a number of instance variable that might be relevant for processing.
 	The class also adds an accept header to the outgoing request, namely
 	text/html and application/xhtml+xml (unless set explicitly by the caller).
 	
+	If a resource has already been retrieved, and the server returned an ETag or a Last-Modified header field
+	at that time, the request is conditional; if the resource has not changed, the earlier data is reused.
+	
 	If the content type is set by the server, the relevant HTTP response field is used. Otherwise,
 	common suffixes are used (see L{host.preferred_suffixes}) to set the content type (this is really of importance
 	for C{file:///} URI-s). If none of these works, the content type is empty.
@@ -66,6 +128,7 @@ class URIOpener :
 	CONTENT_TYPE		= 'Content-Type'
 	LAST_MODIFIED		= 'Last-Modified'
 	EXPIRES				= 'Expires'
+	ETAG				= 'ETag'
 	def __init__(self, name, additional_headers = {}) :
 		"""
 		@param name: URL to be opened
@@ -77,67 +140,82 @@ class URIOpener :
 			if socket.getfqdn().endswith('.w3.org'):
 				import checkremote
 				checkremote.check_url_safety(url)
-			if 'Accept' not in additional_headers:
-				additional_headers['Accept'] = 'text/html, application/xhtml+xml'
-				
-			import requests
-			# Switching off the verification is not cool. But, at least for now, too many
-			# sites still go wrong because the certificates are not o.k. with request...
-			r = requests.get(url, headers=additional_headers, verify=False)
-			self.data	= r.content
-			self.headers	= r.headers
-			
-			if URIOpener.CONTENT_TYPE in self.headers :
-				# The call below will remove the possible media type parameters, like charset settings
-				ct = content_type(self.headers[URIOpener.CONTENT_TYPE])
-				self.content_type = ct.media_type
-				if 'charset' in ct.parmdict :
-					self.charset = ct.parmdict['charset']
-				else :
-					self.charset = None
-				# print
+			# The incoming dictionary (possibly the default value!) should not be modified
+			headers = dict(additional_headers)
+			if 'Accept' not in headers:
+				headers['Accept'] = 'text/html, application/xhtml+xml'
+
+			key = (url, headers['Accept'])
+			validated = _validated_responses.get(key)
+			if validated != None :
+				(etag, last_modified, data, validated_headers, validated_url) = validated
+				if etag != None :
+					headers['If-None-Match'] = etag
+				if last_modified != None :
+					headers['If-Modified-Since'] = last_modified
+
+			r = _get_session().get(url, headers=headers)
+			if r.status_code == 304 and validated != None :
+				# Nothing has changed; the 304 response may still refresh some header fields (eg, Expires)
+				self.data		= data
+				self.headers	= validated_headers.copy()
+				self.headers.update(r.headers)
+				final_url		= validated_url
+			else :
+				self.data		= r.content
+				self.headers	= r.headers
+				final_url		= r.url
+
+			etag			= self.headers.get(URIOpener.ETAG)
+			last_modified	= self.headers.get(URIOpener.LAST_MODIFIED)
+			if (etag != None or last_modified != None) and (r.status_code == 200 or r.status_code == 304) :
+				if key not in _validated_responses and len(_validated_responses) >= _validated_responses_size :
+					del _validated_responses[next(iter(_validated_responses))]
+				_validated_responses[key] = (etag, last_modified, self.data, self.headers, final_url)
+
+			# The header fields are retrieved once each: a (case insensitive) lookup returns None for a missing field
+			ctype = self.headers.get(URIOpener.CONTENT_TYPE)
+			if ctype != None :
+				(self.content_type, self.charset) = _media_type_and_charset(ctype)
 			else :
 				# check if the suffix can be used for the content type; this may be important
 				# for file:// type URI or if the server is not properly set up to return the right
 				# mime type
 				self.charset = None
-				self.content_type = ""
-				for suffix in preferred_suffixes.keys() :
-					if name.endswith(suffix) :
-						self.content_type = preferred_suffixes[suffix]
-						break
+				# All the suffixes are of the form '.xxx', ie, a (case insensitive) dictionary lookup of the tail from the last '.' is enough
+				self.content_type = preferred_suffixes.get(name[name.rfind('.'):].lower(), "")
 			
-			if URIOpener.CONTENT_LOCATION in self.headers :
-				self.location = urljoin(r.url,self.headers[URIOpener.CONTENT_LOCATION])
+			location = self.headers.get(URIOpener.CONTENT_LOCATION)
+			if location != None :
+				self.location = urljoin(final_url,location)
 			else :
 				self.location = name
 			
 			self.expiration_date = datetime.datetime.utcnow() + datetime.timedelta(days=1)
-			if URIOpener.EXPIRES in self.headers :
+			expires = self.headers.get(URIOpener.EXPIRES)
+			if expires != None :
 				try :
 					# Thanks to Deron Meranda for the HTTP date conversion method...
-					self.expiration_date = parse_http_datetime(self.headers[URIOpener.EXPIRES])
+					self.expiration_date = parse_http_datetime(expires)
 				except :
 					# The Expires date format was wrong, sorry, forget it...
 					pass
 
 			self.last_modified_date = None
-			if URIOpener.LAST_MODIFIED in self.headers :
+			if last_modified != None :
 				try :
 					# Thanks to Deron Meranda for the HTTP date conversion method...
-					self.last_modified_date = parse_http_datetime(self.headers[URIOpener.LAST_MODIFIED])
+					self.last_modified_date = parse_http_datetime(last_modified)
 				except :
 					# The last modified date format was wrong, sorry, forget it...
 					pass
 				
 		except urllib_HTTPError :
 			e = sys.exc_info()[1]
-			from . import HTTPError
 			msg = BaseHTTPRequestHandler.responses[e.code]
 			raise HTTPError('%s' % msg[1], e.code)
 		except Exception :
 			e = sys.exc_info()[1]
-			from . import RDFaError
 			raise RDFaError('%s' % e)
 
 #########################################################################################################
@@ -145,25 +223,51 @@ class URIOpener :
 # 'safe' characters for the URI quoting, ie, characters that can safely stay as they are. Other 
 # special characters are converted to their %.. equivalents for namespace prefixes
 _unquotedChars = ':/\?=#~'
-_warnChars     = [' ','\n','\r','\t']
+# Characters that are quoted, but are also worth a warning; one regular expression search is much cheaper than
+# looking for each character separately
+_warnChars     = re.compile('[ \n\r\t]')
+
+# The quoting function, with the 'safe' characters bound once and for all
+if sys.version_info[0] >= 3 :
+	from urllib.parse import quote_from_bytes
+	def _quote(suri) :
+		# This is what quote does for a string, minus the argument juggling on each call
+		return quote_from_bytes(suri.encode('utf-8'), _unquotedChars)
+else :
+	from functools import partial
+	_quote = partial(quote, safe=_unquotedChars)
+
+# The same (vocabulary) URI-s are quoted over and over in a document; the results are stored, keyed by the
+# (stripped) URI. The oldest entry is dropped when the store is full.
+_quoted_URIs		= {}
+_quoted_URIs_size	= 4096
+
+def _cached_quote(suri) :
+	"""
+	Quote a URI via L{_quote}, using the results of earlier calls whenever possible.
+	@param suri: URI, with leading and trailing spaces already stripped
+	@return: quoted URI
+	"""
+	if suri in _quoted_URIs :
+		return _quoted_URIs[suri]
+	if len(_quoted_URIs) >= _quoted_URIs_size :
+		del _quoted_URIs[next(iter(_quoted_URIs))]
+	retval = _quoted_URIs[suri] = _quote(suri)
+	return retval
 
 def quote_URI(uri, options = None) :
 	"""
 	'quote' a URI, ie, exchange special characters for their '%..' equivalents. Some of the characters
-	may stay as they are (listed in L{_unquotedChars}. If one of the characters listed in L{_warnChars} 
+	may stay as they are (listed in L{_unquotedChars}. If one of the characters matched by L{_warnChars} 
 	is also in the uri, an extra warning is also generated.
 	@param uri: URI
 	@param options: 
 	@type options: L{Options<pyRdfa.Options>}
 	"""
-	from . import err_unusual_char_in_URI
 	suri = uri.strip()
-	for c in _warnChars :
-		if suri.find(c) != -1 :
-			if options != None :
-				options.add_warning(err_unusual_char_in_URI % suri)
-			break
-	return quote(suri, _unquotedChars)
+	if options != None and _warnChars.search(suri) != None :
+		options.add_warning(err_unusual_char_in_URI % suri)
+	return _cached_quote(suri)
 	
 #########################################################################################################
 	
@@ -172,7 +276,7 @@ def create_file_name(uri) :
 	Create a suitable file name from an (absolute) URI. Used, eg, for the generation of a file name for a cached vocabulary file.
 	"""
 	suri = uri.strip()
-	final_uri = quote(suri,_unquotedChars)
+	final_uri = _cached_quote(suri)
 	# Remove some potentially dangereous characters
 	return final_uri.replace(' ','_').replace('%','_').replace('-','_').replace('+','_').replace('/','_').replace('?','_').replace(':','_').replace('=','_').replace('#','_')
 
@@ -192,7 +296,8 @@ def has_one_of_attributes(node,*args) :
 	else :
 		rargs = args
 	
-	return True in [ node.hasAttribute(attr) for attr in rargs ]
+	# Stop at the first attribute found, instead of checking all of them
+	return any(node.hasAttribute(attr) for attr in rargs)
 
 #########################################################################################################
 def traverse_tree(node, func) :
@@ -200,12 +305,16 @@ def traverse_tree(node, func) :
 	@param node: DOM element node
 	@param func: function to be called on the node. Input parameter is a DOM Element Node. If the function returns a boolean True, the recursion is stopped.
 	"""
-	if func(node) :
-		return
-
-	for n in node.childNodes :
-		if n.nodeType == node.ELEMENT_NODE :
-			traverse_tree(n, func)
+	# An explicit stack is used instead of recursion: no function call per element, and no issue with the
+	# recursion limit for deep trees
+	ELEMENT_NODE = node.ELEMENT_NODE
+	stack = [node]
+	while stack :
+		n = stack.pop()
+		if func(n) :
+			continue
+		# The children are pushed in reverse order to keep the original, document order of the visits
+		stack.extend([ c for c in reversed(n.childNodes) if c.nodeType == ELEMENT_NODE ])
 
 #########################################################################################################
 def return_XML(state, inode, base = True, xmlns = True) :
@@ -3,6 +3,7 @@ from setuptools import setup
 install_requires=[
     "rdflib",
     "html5lib",
+    "requests",
 ]
 
 setup(name="pyRdfa3",